@@ -1,37 +1,60 @@
 # Arquivo: analyze_results.py (CORRIGIDO)
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+import resultados_db
 
 INPUT_CSV = 'results.csv'
+INPUT_DB = resultados_db.OUTPUT_DB
 OUTPUT_DIR = 'graficos'
 
-def analyze_and_plot_combined():
-    print(f">>> Lendo resultados de '{INPUT_CSV}' <<<")
-    if not os.path.exists(INPUT_CSV):
-        print(f"ERRO: Arquivo '{INPUT_CSV}' não encontrado. Execute 'run_experiments.py' primeiro.")
-        return
+CHAVES = resultados_db.CHAVES
+
+
+def agregar_resultados(input_db=INPUT_DB, input_csv=INPUT_CSV):
+    """
+    Lê as médias por configuração (resultados_db.CHAVES) já mantidas no banco.
+    Se o banco ainda não existe, importa o results.csv uma única vez.
+    """
+    novo = not os.path.exists(input_db)
+    conn = resultados_db.conectar(input_db)
+    try:
+        if novo and os.path.exists(input_csv):
+            total = resultados_db.importar_csv(conn, input_csv)
+            print(f"Importadas {total} execuções de '{input_csv}' para '{input_db}'.")
+        return resultados_db.ler_agregados(conn)
+    finally:
+        conn.close()
+
+
+def imprimir_tabela(agregados):
+    print("\n--- Médias Calculadas ---")
+    headers = list(CHAVES) + ['tempo_medio', 'qualidade_media', 'containers_medios',
+                              'limite_medio', 'gap_medio']
+    print('| ' + ' | '.join(headers) + ' |')
+    print('|' + '---:|' * len(headers))
+    for row in agregados:
+        print('| ' + ' | '.join(
+            '-' if row[h] is None else f"{row[h]:.4f}" if isinstance(row[h], float) else str(row[h])
+            for h in headers
+        ) + ' |')
+
 
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+def plotar_combinado(agregados, output_dir=OUTPUT_DIR, mostrar=True):
+    # bibliotecas de gráficos só são importadas quando um gráfico é pedido
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
-    df = pd.read_csv(INPUT_CSV)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
 
-    # --- Preparação dos Dados ---
-    # Agora a coluna 'containers_alocados' já é numérica
-    df_grouped = df.groupby(['instancia', 'max_iter', 'perturb_size']).agg(
-        tempo_medio=('tempo_s', 'mean'),
-        qualidade_media=('taxa_ocupacao', 'mean'),
-        containers_medios=('containers_alocados', 'mean') # <-- LENDO A COLUNA CORRETA
-    ).reset_index()
+    df_grouped = pd.DataFrame(agregados)
 
     df_grouped['config_label'] = df_grouped['instancia'] + \
                                '\n(iter=' + df_grouped['max_iter'].astype(str) + \
-                               ', perturb=' + df_grouped['perturb_size'].astype(str) + ')'
-
-    print("\n--- Médias Calculadas ---")
-    print(df_grouped)
+                               ', perturb=' + df_grouped['perturb_size'].astype(str) + \
+                               df_grouped['adaptativo'].map({0: '', 1: ', adapt'}) + \
+                               df_grouped['pool_elite'].map(lambda p: f', pool={p}' if p else '') + \
+                               df_grouped['tempo_limite'].map(lambda t: f', t<={t:g}s' if t else '') + ')'
 
     # --- Geração do Gráfico Combinado ---
     fig, ax1 = plt.subplots(figsize=(18, 10))
@@ -67,10 +90,24 @@ def analyze_and_plot_combined():
     plt.title('Análise de Desempenho e Qualidade da Heurística BLI', fontsize=18, pad=20)
     fig.tight_layout()
 
-    path_combinado = os.path.join(OUTPUT_DIR, 'grafico_combinado.png')
+    path_combinado = os.path.join(output_dir, 'grafico_combinado.png')
     plt.savefig(path_combinado)
     print(f"\nGráfico combinado salvo em: '{path_combinado}'")
-    plt.show()
+    if mostrar:
+        plt.show()
+
+
+def analyze_and_plot_combined(input_db=INPUT_DB, input_csv=INPUT_CSV, output_dir=OUTPUT_DIR,
+                              plotar=True, mostrar=True):
+    print(f">>> Lendo resultados de '{input_db}' <<<")
+    if not os.path.exists(input_db) and not os.path.exists(input_csv):
+        print(f"ERRO: Arquivo '{input_db}' não encontrado. Execute 'run_experiments.py' primeiro.")
+        return
+
+    agregados = agregar_resultados(input_db, input_csv)
+    imprimir_tabela(agregados)
+    if plotar and agregados:
+        plotar_combinado(agregados, output_dir, mostrar)
 
 if __name__ == '__main__':
     analyze_and_plot_combined()
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+CLI única do balanceamento: python -m balanceamento solve|sweep|report
+
+Cada subcomando importa seus módulos só quando é executado; pandas,
+matplotlib e seaborn são carregados apenas por `report` quando um gráfico
+é pedido.
+"""
+import argparse
+import sys
+
+# Valores padrão repetidos aqui para não importar os scripts só para ler constantes
+VESSEL_PROFILE = 'bases/navio/vessel_S.txt'
+INSTANCIAS_DIR = 'bases/container/Vessel_S'
+INSTANCIAS = ['VSLow1', 'VSMed1', 'VSHigh1']
+RESULTS_CSV = 'results.csv'
+RESULTS_DB = 'results.db'
+GRAFICOS_DIR = 'graficos'
+
+
+def cmd_solve(args):
+    import main
+    main.main(
+        instancias=args.instancias,
+        max_iter=args.max_iter,
+        perturb_size=args.perturb_size,
+        vessel_profile=args.vessel,
+        instancias_dir=args.instancias_dir,
+        tempo_limite=args.tempo_limite,
+        exato=args.exato,
+        adaptativo=args.adaptativo,
+        pool_elite=args.pool_elite,
+    )
+
+
+def cmd_sweep(args):
+    import run_experiments
+    run_experiments.run_all_experiments(
+        instancias=args.instancias,
+        max_iters=args.max_iter,
+        perturb_sizes=args.perturb_size,
+        repeticoes=args.repeticoes,
+        vessel_profile=args.vessel,
+        instancias_dir=args.instancias_dir,
+        output_csv=args.saida,
+        output_db=args.db,
+        adaptativos=[bool(a) for a in args.adaptativo],
+        pools_elite=args.pool_elite,
+        tempo_limite=args.tempo_limite,
+    )
+
+
+def cmd_report(args):
+    import analyze_results
+    analyze_results.analyze_and_plot_combined(
+        input_db=args.db,
+        input_csv=args.entrada,
+        output_dir=args.graficos,
+        plotar=not args.sem_grafico,
+        mostrar=args.mostrar,
+    )
+
+
+def _add_instancia_args(p):
+    p.add_argument('--vessel', default=VESSEL_PROFILE, help='perfil do navio (.txt/.csv)')
+    p.add_argument('--instancias-dir', default=INSTANCIAS_DIR,
+                   help='diretório com os CSVs de contêineres')
+    p.add_argument('--instancias', nargs='+', default=INSTANCIAS)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='balanceamento',
+                                     description='Heurística BLI de balanceamento de contêineres.')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('solve', help='resolve as instâncias e imprime a tabela de resultados')
+    _add_instancia_args(p)
+    p.add_argument('--max-iter', type=int, default=20)
+    p.add_argument('--perturb-size', type=int, default=2)
+    p.add_argument('--tempo-limite', type=float, default=None, help='segundos por instância')
+    p.add_argument('--exato', action='store_true',
+                   help='branch-and-bound em instâncias pequenas em vez da ILS')
+    p.add_argument('--adaptativo', action='store_true',
+                   help='ajusta força e operador de perturbação durante a ILS '
+                        '(--perturb-size vira a força inicial)')
+    p.add_argument('--pool-elite', type=int, default=0,
+                   help='tamanho do pool de soluções de elite (0 desativa)')
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser('sweep', help='varre parâmetros e acrescenta as execuções ao CSV')
+    _add_instancia_args(p)
+    p.add_argument('--max-iter', type=int, nargs='+', default=[20])
+    p.add_argument('--perturb-size', type=int, nargs='+', default=[2])
+    p.add_argument('--adaptativo', type=int, nargs='+', choices=[0, 1], default=[0],
+                   help='0 = perturbação fixa, 1 = adaptativa; "0 1" compara as duas')
+    p.add_argument('--pool-elite', type=int, nargs='+', default=[0],
+                   help='tamanhos do pool de elite a testar (0 desativa)')
+    p.add_argument('--tempo-limite', type=float, default=None, help='segundos por execução')
+    p.add_argument('--repeticoes', type=int, default=5)
+    p.add_argument('--saida', default=RESULTS_CSV)
+    p.add_argument('--db', default=RESULTS_DB, help='banco SQLite com execuções e agregados')
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser('report', help='resume os resultados e gera o gráfico combinado')
+    p.add_argument('--db', default=RESULTS_DB, help='banco SQLite com os agregados')
+    p.add_argument('--entrada', default=RESULTS_CSV,
+                   help='CSV importado para o banco quando este ainda não existe')
+    p.add_argument('--graficos', default=GRAFICOS_DIR)
+    p.add_argument('--sem-grafico', action='store_true', help='só imprime a tabela')
+    p.add_argument('--mostrar', action='store_true', help='abre a janela do gráfico')
+    p.set_defaults(func=cmd_report)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,10 @@
+import argparse
 import csv
 import random
-import re
 import os
 import glob
+import zlib
+from multiprocessing import Pool
 
 # Parâmetros de variação (±10% do peso nominal)
 VARIACAO = 0.1
@@ -10,79 +12,162 @@ VARIACAO = 0.1
 # Diretório raiz onde estão as pastas Vessel_S, Vessel_M e Vessel_L
 BASE_DIR = 'bases/containerEmTxt'
 PASTAS = ['Vessel_S', 'Vessel_M', 'Vessel_L']
+SAIDA_DIR = 'containers_csv'
 
-def parse_transport_types(lines):
+# Semente base e multiplicador de tamanho padrão (1.0 = manifesto original)
+SEED = 0
+MULTIPLICADOR = 1.0
+
+# Quantidade de linhas acumuladas antes de cada escrita em bloco no CSV
+TAMANHO_BLOCO = 4096
+
+
+def ler_manifesto(caminho_arquivo):
+    """
+    Lê o TXT linha a linha (sem carregar o arquivo inteiro) e retorna
+    (transport_types, tids): o mapa id -> (comprimento, peso nominal) e a
+    sequência de typeIds do bloco '# Container', na ordem do arquivo.
+    """
     types = {}
-    for ln in lines:
-        ln = ln.strip()
-        if ln.startswith('# Container'):
-            break
-        if ln.startswith('#') or not ln:
-            continue
-        parts = ln.split()
-        if len(parts) == 4 and re.match(r'^\d+$', parts[0]):
-            tid, length, weight, _ = parts
-            types[int(tid)] = (int(length), int(weight))
-    return types
-
-def parse_containers(lines, transport_types):
-    containers = []
+    tids = []
     in_block = False
-    cid = 0
-    for ln in lines:
-        ln = ln.strip()
-        if ln.startswith('# Container'):
-            in_block = True
-            continue
-        if not in_block:
-            continue
-        if ln.startswith('#') or not ln:
-            break
-        parts = ln.split()
-        if len(parts) < 3:
-            continue
-        _, _, tid, *_ = parts
-        tid = int(tid)
-        if tid not in transport_types:
-            continue
-        length, nominal = transport_types[tid]
-        peso = int(random.uniform(nominal * (1 - VARIACAO), nominal * (1 + VARIACAO)))
-        containers.append({
-            'id': cid,
-            'tipo': f'{length}ft',
-            'peso': peso
-        })
-        cid += 1
-    return containers
-
-def processar_arquivo(caminho_arquivo, caminho_saida_csv):
     with open(caminho_arquivo, 'r') as f:
-        lines = f.readlines()
+        for ln in f:
+            ln = ln.strip()
+            if ln.startswith('# Container'):
+                in_block = True
+                continue
+            if not in_block:
+                if ln.startswith('#') or not ln:
+                    continue
+                parts = ln.split()
+                if len(parts) == 4 and parts[0].isdigit():
+                    tid, length, weight, _ = parts
+                    types[int(tid)] = (int(length), int(weight))
+                continue
+            if ln.startswith('#') or not ln:
+                break
+            parts = ln.split()
+            if len(parts) < 3:
+                continue
+            tid = int(parts[2])
+            if tid in types:
+                tids.append(tid)
+    return types, tids
+
+
+def gerar_linhas(transport_types, tids, rng, multiplicador=1.0):
+    """
+    Gera as linhas (id, tipo, peso) do manifesto sintético. Com
+    `multiplicador` > 1 a sequência de tipos é repetida ciclicamente até
+    atingir round(len(tids) * multiplicador) contêineres, sorteando um novo
+    peso para cada réplica.
+    """
+    if not tids:
+        return
+    total = int(round(len(tids) * multiplicador))
+    # pré-calcula limites e rótulo por tipo para não refazer a cada linha
+    faixas = {
+        tid: (f'{length}ft', nominal * (1 - VARIACAO), nominal * (1 + VARIACAO))
+        for tid, (length, nominal) in transport_types.items()
+    }
+    uniform = rng.uniform
+    n = len(tids)
+    for cid in range(total):
+        tipo, lo, hi = faixas[tids[cid % n]]
+        yield (cid, tipo, int(uniform(lo, hi)))
 
-    transport_types = parse_transport_types(lines)
-    containers = parse_containers(lines, transport_types)
+
+def seed_arquivo(caminho_arquivo, seed, replica=0):
+    """
+    Semente estável por arquivo, derivada da tupla (semente base, réplica,
+    nome), de modo que sementes base vizinhas não repitam manifestos.
+    """
+    nome = os.path.basename(caminho_arquivo)
+    return zlib.crc32(f'{seed}:{replica}:{nome}'.encode())
+
+
+def processar_arquivo(caminho_arquivo, caminho_saida_csv, seed=None, multiplicador=1.0):
+    """
+    Converte um TXT de contêineres em CSV (id, tipo, peso). Usa um
+    random.Random próprio para que o mesmo `seed` gere sempre o mesmo CSV.
+    Retorna a quantidade de contêineres escrita.
+    """
+    rng = random.Random(seed)
+    transport_types, tids = ler_manifesto(caminho_arquivo)
 
     # Garante que o diretório de saída existe
-    os.makedirs(os.path.dirname(caminho_saida_csv), exist_ok=True)
+    os.makedirs(os.path.dirname(caminho_saida_csv) or '.', exist_ok=True)
 
-    # Escreve o CSV
+    # Escreve o CSV em blocos de TAMANHO_BLOCO linhas
+    total = 0
     with open(caminho_saida_csv, 'w', newline='') as csvfile:
-        fieldnames = ['id', 'tipo', 'peso']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for c in containers:
-            writer.writerow(c)
-
-    print(f'[{caminho_arquivo}] → Gerado {len(containers)} contêineres em "{caminho_saida_csv}".')
-
-def main():
-    for pasta in PASTAS:
-        caminho_pasta = os.path.join(BASE_DIR, pasta)
-        arquivos_txt = glob.glob(os.path.join(caminho_pasta, '*.txt'))
-        for arquivo in arquivos_txt:
+        writer = csv.writer(csvfile)
+        writer.writerow(['id', 'tipo', 'peso'])
+        bloco = []
+        for row in gerar_linhas(transport_types, tids, rng, multiplicador):
+            bloco.append(row)
+            if len(bloco) >= TAMANHO_BLOCO:
+                writer.writerows(bloco)
+                total += len(bloco)
+                bloco = []
+        writer.writerows(bloco)
+        total += len(bloco)
+
+    return total
+
+
+def _processar_tarefa(tarefa):
+    caminho_arquivo, caminho_saida, seed, multiplicador = tarefa
+    total = processar_arquivo(caminho_arquivo, caminho_saida, seed, multiplicador)
+    return caminho_arquivo, caminho_saida, total
+
+
+def listar_tarefas(base_dir=BASE_DIR, pastas=PASTAS, saida_dir=SAIDA_DIR,
+                   seed=SEED, multiplicador=MULTIPLICADOR, copias=1):
+    """
+    Monta a lista de tarefas (entrada, saída, seed, multiplicador). Com
+    `copias` > 1 gera várias instâncias por arquivo, cada uma com sua semente
+    e sufixo `_rNN` no nome do CSV.
+    """
+    tarefas = []
+    for pasta in pastas:
+        caminho_pasta = os.path.join(base_dir, pasta)
+        for arquivo in sorted(glob.glob(os.path.join(caminho_pasta, '*.txt'))):
             nome_base = os.path.splitext(os.path.basename(arquivo))[0]
-            caminho_saida = os.path.join('containers_csv', pasta, f'{nome_base}.csv')
-            processar_arquivo(arquivo, caminho_saida)
+            for r in range(copias):
+                nome = nome_base if copias == 1 else f'{nome_base}_r{r:02d}'
+                caminho_saida = os.path.join(saida_dir, pasta, f'{nome}.csv')
+                tarefas.append((arquivo, caminho_saida,
+                                seed_arquivo(arquivo, seed, r), multiplicador))
+    return tarefas
+
+
+def gerar_em_lote(tarefas, processos=None):
+    """Executa as tarefas em paralelo num Pool de processos."""
+    with Pool(processes=processos) as pool:
+        for arquivo, saida, total in pool.imap_unordered(_processar_tarefa, tarefas):
+            print(f'[{arquivo}] → Gerado {total} contêineres em "{saida}".')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Gera CSVs de contêineres a partir dos TXT de containerEmTxt.')
+    parser.add_argument('--base-dir', default=BASE_DIR)
+    parser.add_argument('--pastas', nargs='+', default=PASTAS)
+    parser.add_argument('--saida', default=SAIDA_DIR)
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--multiplicador', type=float, default=MULTIPLICADOR,
+                        help='fator de escala do número de contêineres por manifesto')
+    parser.add_argument('--copias', type=int, default=1,
+                        help='instâncias geradas por arquivo, cada uma com sua semente')
+    parser.add_argument('--processos', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    tarefas = listar_tarefas(args.base_dir, args.pastas, args.saida,
+                             args.seed, args.multiplicador, args.copias)
+    gerar_em_lote(tarefas, args.processos)
+
 
 if __name__ == '__main__':
     main()
@@ -1,5 +1,8 @@
 import random
+import time
+from collections import Counter
 from carregar_vessel import VesselProfile
+from pool_solucoes import chave_zobrist
 
 class Container:
     def __init__(self, cid, tipo, peso):
@@ -25,6 +28,8 @@ class Navio:
         # estado da alocação
         self.allocated = []        # lista de objetos Container
         self.positions = {}        # mapa (x,y) -> ocupação
+        self.atribuicao = {}       # mapa id do container -> (x,y) neste navio
+        self.hash = 0              # hash de Zobrist de `atribuicao`
 
     def adicionar_container(self, container, x, y):
         """Compatibilidade com greedy_allocation"""
@@ -35,6 +40,8 @@ class Navio:
         container.position = (x, y)
         self.allocated.append(container)
         self.positions[(x, y)] = self.positions.get((x, y), 0) + 1
+        self.atribuicao[container.id] = (x, y)
+        self.hash ^= chave_zobrist(container.id, x, y)
 
     def verificar_restricoes(self, container, x, y):
         """
@@ -49,15 +56,16 @@ class Navio:
             return False
 
         # 2) Peso por pilha
-        peso_pilha = sum(c.peso for c in self.allocated if c.position == (x, y))
+        pos = self.atribuicao
+        peso_pilha = sum(c.peso for c in self.allocated if pos[c.id] == (x, y))
         if peso_pilha + container.peso > self.peso_max_pilha:
             return False
 
         # prepara dados atuais
         total_peso = sum(c.peso for c in self.allocated)
-        total_m_long = sum(c.peso * (c.position[0] / (self.num_baias - 1))
+        total_m_long = sum(c.peso * (pos[c.id][0] / (self.num_baias - 1))
                         for c in self.allocated)
-        total_m_trans = sum(c.peso * (c.position[1] / (self.num_pilhas - 1))
+        total_m_trans = sum(c.peso * (pos[c.id][1] / (self.num_pilhas - 1))
                             for c in self.allocated)
 
         # valores normalizados da posição candidata
@@ -89,7 +97,7 @@ class Navio:
         novo = Navio(self._vessel_profile)
         # reproduz todas as alocações no clone
         for c in self.allocated:
-            x, y = c.position
+            x, y = self.atribuicao[c.id]
             novo.alocar(c, x, y)
         return novo
     
@@ -97,7 +105,9 @@ class Navio:
     def _remove(self, container):
         """Remove um container de allocated e atualiza positions."""
         self.allocated.remove(container)
-        x, y = container.position
+        # containers são compartilhados entre clones: usa a posição registrada aqui
+        x, y = self.atribuicao.pop(container.id)
+        self.hash ^= chave_zobrist(container.id, x, y)
         # atualiza contador de posição
         if self.positions.get((x, y), 0) > 1:
             self.positions[(x, y)] -= 1
@@ -110,10 +120,11 @@ def evaluate(navio):
 
 # Adicione esta nova função em heuristica_distribuicao.py
 
-def simple_initial_solution(containers, navio):
+def simple_initial_solution(containers, navio, prazo=None):
     """
     Cria uma solução inicial posicionando os contêineres sequencialmente nas
-    primeiras posições válidas encontradas.
+    primeiras posições válidas encontradas. Se `prazo` (instante em
+    time.perf_counter) passar, para e retorna a solução parcial.
     """
     print("Construindo solução inicial simples...")
     
@@ -123,6 +134,8 @@ def simple_initial_solution(containers, navio):
                      for y in range(navio.num_pilhas)]
 
     for c in containers:
+        if prazo is not None and time.perf_counter() >= prazo:
+            break
         # For each container, try to find a valid spot
         for x, y in all_positions:
             if navio.verificar_restricoes(c, x, y):
@@ -133,22 +146,15 @@ def simple_initial_solution(containers, navio):
     # This function modifies 'navio' directly and returns it
     return navio
 
-def perturb(navio, perturb_size):
-    """
-    Remove até `perturb_size` containers aleatoriamente e realoca-os
-    (usando sempre navio.alocar), sem duplicar objetos.
-    """
-    k = min(perturb_size, len(navio.allocated))
-    if k == 0:
-        return navio
-
-    indices = random.sample(range(len(navio.allocated)), k)
+def _remover_indices(navio, indices):
+    """Remove de navio.allocated os índices dados e atualiza positions."""
     removed = []
 
     # remove containers (do topo para baixo) e atualiza positions
     for idx in sorted(indices, reverse=True):
         c = navio.allocated.pop(idx)
-        x, y = c.position
+        x, y = navio.atribuicao.pop(c.id)
+        navio.hash ^= chave_zobrist(c.id, x, y)
 
         cnt = navio.positions.get((x, y), 0)
         if cnt > 1:
@@ -158,7 +164,11 @@ def perturb(navio, perturb_size):
 
         removed.append(c)
 
-    # tenta realocar cada um
+    return removed
+
+
+def _realocar(navio, removed):
+    """Tenta realocar cada container removido numa posição válida aleatória."""
     for c in removed:
         positions = [(x, y)
                      for x in range(navio.num_baias)
@@ -169,26 +179,159 @@ def perturb(navio, perturb_size):
                 navio.alocar(c, x, y)
                 break
 
+
+def perturb(navio, perturb_size):
+    """
+    Remove até `perturb_size` containers aleatoriamente e realoca-os
+    (usando sempre navio.alocar), sem duplicar objetos.
+    """
+    k = min(perturb_size, len(navio.allocated))
+    if k == 0:
+        return navio
+
+    indices = random.sample(range(len(navio.allocated)), k)
+    _realocar(navio, _remover_indices(navio, indices))
+
+    return navio
+
+
+def perturb_baia(navio, perturb_size):
+    """
+    Remove até `perturb_size` containers de uma mesma baia, sorteada entre
+    as ocupadas, e realoca-os em qualquer posição válida.
+    """
+    if not navio.allocated:
+        return navio
+
+    baia = navio.atribuicao[random.choice(navio.allocated).id][0]
+    da_baia = [i for i, c in enumerate(navio.allocated) if navio.atribuicao[c.id][0] == baia]
+    indices = random.sample(da_baia, min(perturb_size, len(da_baia)))
+    _realocar(navio, _remover_indices(navio, indices))
+
     return navio
 
 
+def perturb_pilha_pesada(navio, perturb_size):
+    """
+    Remove até `perturb_size` containers das pilhas mais pesadas (começando
+    pela mais pesada) e realoca-os em qualquer posição válida.
+    """
+    if not navio.allocated:
+        return navio
+
+    pesos = {}
+    for c in navio.allocated:
+        pos = navio.atribuicao[c.id]
+        pesos[pos] = pesos.get(pos, 0) + c.peso
+    ordem = {pos: r for r, pos in enumerate(sorted(pesos, key=pesos.get, reverse=True))}
+
+    por_pilha = sorted(range(len(navio.allocated)),
+                       key=lambda i: ordem[navio.atribuicao[navio.allocated[i].id]])
+    _realocar(navio, _remover_indices(navio, por_pilha[:perturb_size]))
+
+    return navio
+
+
+OPERADORES_PERTURBACAO = {
+    'aleatoria': perturb,
+    'baia': perturb_baia,
+    'pilha_pesada': perturb_pilha_pesada,
+}
+
+
+class PerturbacaoAdaptativa:
+    """
+    Controle adaptativo da perturbação (estilo ALNS):
+    - escolhe o operador por roleta, com pesos atualizados a cada `segmento`
+      iterações conforme a pontuação média obtida por cada operador
+      (`recompensas` = (nova melhor, mesmo valor, pior));
+    - ajusta a força (quantos containers remover) pela taxa de melhoria do
+      segmento: sem melhorias aumenta, acima de `taxa_alvo` diminui.
+    """
+
+    def __init__(self, forca_inicial=2, forca_min=1, forca_max=32,
+                 operadores=OPERADORES_PERTURBACAO, segmento=10, reacao=0.3,
+                 recompensas=(5.0, 1.0, 0.0), taxa_alvo=0.2, peso_min=0.05):
+        self.operadores = dict(operadores)
+        self.forca = max(forca_min, min(forca_inicial, forca_max))
+        self.forca_min = forca_min
+        self.forca_max = forca_max
+        self.segmento = segmento
+        self.reacao = reacao
+        self.recompensas = recompensas
+        self.taxa_alvo = taxa_alvo
+        self.peso_min = peso_min
+        self.pesos = {nome: 1.0 for nome in self.operadores}
+        self._reiniciar_segmento()
+
+    def _reiniciar_segmento(self):
+        self._pontos = {nome: 0.0 for nome in self.operadores}
+        self._usos = {nome: 0 for nome in self.operadores}
+        self._iteracoes = 0
+        self._melhorias = 0
+
+    def escolher(self):
+        """Sorteia um operador pela roleta; retorna (nome, função)."""
+        nomes = list(self.operadores)
+        nome = random.choices(nomes, weights=[self.pesos[n] for n in nomes])[0]
+        return nome, self.operadores[nome]
+
+    def perturbar(self, navio):
+        """Aplica um operador sorteado com a força atual; retorna (nome, navio)."""
+        nome, op = self.escolher()
+        return nome, op(navio, self.forca)
+
+    def registrar(self, nome, cand_score, best_score):
+        """Registra o resultado de uma iteração e, ao fim do segmento, adapta pesos e força."""
+        if cand_score > best_score:
+            pontos = self.recompensas[0]
+            self._melhorias += 1
+        elif cand_score == best_score:
+            pontos = self.recompensas[1]
+        else:
+            pontos = self.recompensas[2]
+        self._pontos[nome] += pontos
+        self._usos[nome] += 1
+        self._iteracoes += 1
 
+        if self._iteracoes < self.segmento:
+            return
 
-def local_search(navio, max_no_improve=50):
+        for n, usos in self._usos.items():
+            if usos:
+                media = self._pontos[n] / usos
+                self.pesos[n] = max(self.peso_min,
+                                    (1 - self.reacao) * self.pesos[n] + self.reacao * media)
+
+        taxa = self._melhorias / self._iteracoes
+        if taxa == 0:
+            self.forca = min(self.forca_max, self.forca + 1)
+        elif taxa > self.taxa_alvo:
+            self.forca = max(self.forca_min, self.forca - 1)
+
+        self._reiniciar_segmento()
+
+
+
+
+def local_search(navio, max_no_improve=50, prazo=None):
     """
     Busca local por swap: tenta trocar dois containers de lugar
-    e aceita apenas se houver melhoria.
+    e aceita apenas se houver melhoria. Encerra ao passar `prazo`
+    (instante em time.perf_counter), retornando a melhor até ali.
     """
     best = navio.clone()
     best_score = evaluate(best)
     no_improve = 0
 
     while no_improve < max_no_improve and len(best.allocated) >= 2:
+        if prazo is not None and time.perf_counter() >= prazo:
+            break
         cand = best.clone()
         i1, i2 = random.sample(range(len(cand.allocated)), 2)
         c1, c2 = cand.allocated[i1], cand.allocated[i2]
-        x1, y1 = c1.position
-        x2, y2 = c2.position
+        x1, y1 = cand.atribuicao[c1.id]
+        x2, y2 = cand.atribuicao[c2.id]
 
         # remove antes de trocar
         cand._remove(c1)
@@ -214,30 +357,105 @@ def local_search(navio, max_no_improve=50):
 
 
 
-def heuristica_distribuicao(containers, navio, max_iter=100, perturb_size=2):
+def heuristica_distribuicao(containers, navio, max_iter=100, perturb_size=2,
+                            tempo_limite=None, callback=None, limite=None,
+                            adaptativo=False, pool=None, reinicio=20):
     """
     Heurística baseada em ILS:
     1. Alocação inicial gulosa
     2. Iterated Local Search com perturbações e busca local
+
+    `tempo_limite` (segundos) vale para a execução inteira: é checado na
+    construção gulosa, em cada iteração do ILS e dentro da busca local.
+    `callback(iteracao, best, best_score)` é chamado após a solução inicial e
+    a cada melhoria, permitindo acompanhar soluções parciais.
+    `limite` é um limite superior do número de alocações (ver
+    solucao_exata.limite_superior): ao atingi-lo o ILS para, pois não há
+    como melhorar.
+    Os ids dos containers devem ser únicos (ValueError caso contrário).
+    `adaptativo` troca a perturbação fixa por PerturbacaoAdaptativa, que
+    parte de `perturb_size` e ajusta força e operador durante a busca.
+    `pool` (pool_solucoes.PoolElite) guarda soluções de elite: candidatos
+    que recaem numa configuração já visitada, antes ou depois da busca
+    local, são descartados (e contam como piora para o operador), e após
+    `reinicio` iterações sem melhoria a busca recomeça da solução de elite
+    mais distante da melhor.
     """
+    # a solução (Navio.atribuicao, hash, pool) é indexada pelo id do container
+    contagem = Counter(c.id for c in containers)
+    repetidos = sorted(cid for cid, n in contagem.items() if n > 1)
+    if repetidos:
+        raise ValueError(f"Ids de container repetidos: {repetidos[:10]}")
+
+    inicio = time.perf_counter()
+    prazo = inicio + tempo_limite if tempo_limite is not None else None
+
     # etapa 1: alocação inicial gulosa
-    simple_initial_solution(containers, navio)
+    simple_initial_solution(containers, navio, prazo)
     
     # clona solução inicial
     best = navio.clone()
     best_score = evaluate(best)
+    if callback is not None:
+        callback(0, best, best_score)
+
+    controlador = PerturbacaoAdaptativa(forca_inicial=perturb_size) if adaptativo else None
+
+    # ponto de partida das perturbações: a melhor solução, salvo reinícios
+    atual = best
+    sem_melhora = 0
+    if pool is not None:
+        por_id = {c.id: c for c in containers}
+        pool.ja_visto(best.hash)
+        pool.adicionar(best, best_score)
 
     # etapa 2: loop de ILS
-    for _ in range(max_iter):
+    for it in range(1, max_iter + 1):
+        if limite is not None and best_score >= limite:
+            break
+        if prazo is not None and time.perf_counter() >= prazo:
+            break
         # cópia e perturbação
-        cand = best.clone()
-        cand = perturb(cand, perturb_size)
-        # busca local
-        cand = local_search(cand)
-        cand_score = evaluate(cand)
-        # aceita melhor
-        if cand_score > best_score:
-            best = cand
-            best_score = cand_score
+        cand = atual.clone()
+        if controlador is not None:
+            operador, cand = controlador.perturbar(cand)
+        else:
+            cand = perturb(cand, perturb_size)
+        # configuração repetida: não vale refazer a busca local
+        repetido = pool is not None and pool.ja_visto(cand.hash)
+        if not repetido:
+            # busca local
+            perturbado = cand.hash
+            cand = local_search(cand, prazo=prazo)
+            # a busca local também pode levar a uma configuração já visitada
+            repetido = (pool is not None and cand.hash != perturbado
+                        and pool.ja_visto(cand.hash))
+        if repetido:
+            # conta como resultado pior para o operador que o gerou
+            if controlador is not None:
+                controlador.registrar(operador, best_score - 1, best_score)
+            sem_melhora += 1
+        else:
+            cand_score = evaluate(cand)
+            if controlador is not None:
+                controlador.registrar(operador, cand_score, best_score)
+            if pool is not None:
+                pool.adicionar(cand, cand_score)
+            # aceita melhor
+            if cand_score > best_score:
+                best = atual = cand
+                best_score = cand_score
+                sem_melhora = 0
+                if callback is not None:
+                    callback(it, best, best_score)
+            else:
+                sem_melhora += 1
+
+        # estagnação: recomeça de uma solução de elite diversa
+        if pool is not None and sem_melhora >= reinicio:
+            elite = pool.diversa(best)
+            if elite is not None:
+                atual = pool.restaurar(elite, Navio(best._vessel_profile), por_id)
+            sem_melhora = 0
 
-    return best
\ No newline at end of file
+    return best
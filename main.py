@@ -1,7 +1,10 @@
+import os
 import time
 import statistics
 import carregar_containers_csv
 import heuristica_distribuicao
+import solucao_exata
+from pool_solucoes import PoolElite
 from carregar_vessel import load_vessel_profile
 
 # Parâmetros da heurística BLI (ILS), conforme artigo 2.4.2
@@ -12,7 +15,8 @@ PERTURB_SIZE = 2
 # Ajuste o caminho base se a sua estrutura de pastas for diferente
 BASE_PATH = './' 
 INSTANCIAS = ['VSLow1', 'VSMed1', 'VSHigh1']
-VESSEL_PROFILE = f'{BASE_PATH}bases/navio/vessel_s.txt'
+VESSEL_PROFILE = f'{BASE_PATH}bases/navio/vessel_S.txt'
+INSTANCIAS_DIR = f'{BASE_PATH}bases/container/Vessel_S'
 
 def calcular_metricas(solucao_final, vessel_profile):
     """
@@ -28,10 +32,12 @@ def calcular_metricas(solucao_final, vessel_profile):
         return 0.0, 0.0, 0.0
 
     # Calcula o Centro de Gravidade (CG) Normalizado
-    # A posição do contêiner é uma tupla (baia, fileira, nível)
+    # A posição de cada contêiner vem de solucao_final.atribuicao (baia, fileira):
+    # c.position é compartilhado entre clones e pode estar desatualizado.
     # Normalizamos dividindo pela dimensão correspondente - 1 para obter um valor entre 0 e 1.
-    m_long = sum(c.peso * (c.position[0] / (vessel_profile.num_baias - 1)) for c in solucao_final.allocated)
-    m_trans = sum(c.peso * (c.position[1] / (vessel_profile.num_pilhas - 1)) for c in solucao_final.allocated)
+    pos = solucao_final.atribuicao
+    m_long = sum(c.peso * (pos[c.id][0] / (vessel_profile.num_baias - 1)) for c in solucao_final.allocated)
+    m_trans = sum(c.peso * (pos[c.id][1] / (vessel_profile.num_pilhas - 1)) for c in solucao_final.allocated)
 
     cg_long_norm = m_long / total_peso
     cg_trans_norm = m_trans / total_peso
@@ -40,7 +46,7 @@ def calcular_metricas(solucao_final, vessel_profile):
     pesos_por_pilha = {}
     for c in solucao_final.allocated:
         # A identidade da pilha é sua coordenada (baia, fileira)
-        pilha_id = (c.position[0], c.position[1])
+        pilha_id = pos[c.id]
         pesos_por_pilha[pilha_id] = pesos_por_pilha.get(pilha_id, 0) + c.peso
 
     lista_de_pesos = list(pesos_por_pilha.values())
@@ -49,28 +55,44 @@ def calcular_metricas(solucao_final, vessel_profile):
     return cg_long_norm, cg_trans_norm, desvio_padrao
 
 
-def main():
+def main(instancias=INSTANCIAS, max_iter=MAX_ITER, perturb_size=PERTURB_SIZE,
+         vessel_profile=VESSEL_PROFILE, instancias_dir=INSTANCIAS_DIR,
+         tempo_limite=None, exato=False, adaptativo=False, pool_elite=0):
     print("Iniciando a execução dos experimentos...")
-    vessel = load_vessel_profile(VESSEL_PROFILE)
+    vessel = load_vessel_profile(vessel_profile)
     resultados_finais = []
 
-    for inst_nome in INSTANCIAS:
+    for inst_nome in instancias:
         print(f"\n--- Processando instância: {inst_nome} ---")
         
         # Carrega a lista de contêineres para a instância atual
-        path_instancia = f"{BASE_PATH}bases/container/vessel_s/{inst_nome}.csv"
+        path_instancia = os.path.join(instancias_dir, f"{inst_nome}.csv")
         containers_a_alocar = carregar_containers_csv.carregar_containers_csv(path_instancia)
         total_de_containers = len(containers_a_alocar)
 
         # Cria um objeto Navio vazio para a execução
         navio = heuristica_distribuicao.Navio(vessel)
+        limite = solucao_exata.limite_superior(containers_a_alocar, vessel)
 
-        # Executa a sua heurística
         start_time = time.perf_counter()
-        # Assumindo que sua função retorna o objeto Navio com a solução final
-        solucao_final = heuristica_distribuicao.heuristica_distribuicao(
-            containers_a_alocar, navio, MAX_ITER, PERTURB_SIZE
-        )
+        if exato and total_de_containers <= solucao_exata.LIMITE_EXATO:
+            # Instância pequena: busca exata na ordem da instância; o gap continua
+            # medido contra o limite superior, pois outra ordem pode alocar mais
+            solucao_final, otimo_na_ordem = solucao_exata.branch_and_bound(containers_a_alocar, vessel)
+            if not otimo_na_ordem:
+                print("Orçamento de nós esgotado: melhor solução encontrada até aqui.")
+        else:
+            if exato:
+                print(f"Instância com mais de {solucao_exata.LIMITE_EXATO} contêineres: usando ILS.")
+            # ILS encerra ao atingir o limite superior
+            pool = PoolElite(pool_elite) if pool_elite > 0 else None
+            solucao_final = heuristica_distribuicao.heuristica_distribuicao(
+                containers_a_alocar, navio, max_iter, perturb_size,
+                tempo_limite=tempo_limite, limite=limite, adaptativo=adaptativo,
+                pool=pool
+            )
+            if pool is not None:
+                print(f"Pool de elite: {len(pool)} soluções, {pool.duplicatas} duplicatas evitadas.")
         end_time = time.perf_counter()
         duracao = end_time - start_time
 
@@ -83,6 +105,8 @@ def main():
         resultados_finais.append({
             'Instância': inst_nome,
             'Contêineres Alocados': f"{alocados}/{total_de_containers}",
+            'Limite Superior': limite,
+            'Gap (%)': round(solucao_exata.calcular_gap(alocados, limite) * 100, 2),
             'Taxa de Ocupação (%)': round(taxa_ocupacao, 2),
             'Tempo (s)': round(duracao, 2),
             'CG Long. (Norm)': round(cg_long, 4),
@@ -0,0 +1,135 @@
+"""
+Pool de soluções de elite com detecção de duplicatas por hash de Zobrist.
+
+O hash de uma solução é o XOR das chaves (container, pilha) de todos os
+contêineres alocados, de modo que Navio o atualiza em O(1) a cada alocação
+ou remoção. As chaves são derivadas por splitmix64, sem tabela em memória.
+O pool guarda as soluções de elite como arrays compactos e um conjunto LRU
+limitado de hashes já visitados; a memória não cresce com a duração da busca.
+"""
+from array import array
+from collections import OrderedDict
+
+_MASCARA = (1 << 64) - 1
+
+# Capacidades padrão do pool de elite e do registro de hashes visitados
+CAPACIDADE_ELITE = 16
+CAPACIDADE_VISTOS = 50000
+
+
+def _splitmix64(z):
+    z = (z + 0x9E3779B97F4A7C15) & _MASCARA
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASCARA
+    return z ^ (z >> 31)
+
+
+def chave_zobrist(cid, x, y):
+    """Chave de 64 bits do par (container, pilha)."""
+    return _splitmix64((cid << 24) ^ (x << 12) ^ y)
+
+
+def hash_zobrist(navio):
+    """Recalcula do zero o hash de um navio (útil para conferir o incremental)."""
+    h = 0
+    for cid, (x, y) in navio.atribuicao.items():
+        h ^= chave_zobrist(cid, x, y)
+    return h
+
+
+class SolucaoCompacta:
+    """Solução codificada: ids dos contêineres e índice da pilha de cada um."""
+
+    __slots__ = ('hash', 'score', 'ids', 'pilhas')
+
+    def __init__(self, navio, score):
+        self.hash = navio.hash
+        self.score = score
+        self.ids = array('l', (c.id for c in navio.allocated))
+        self.pilhas = array('l', (navio.atribuicao[c.id][0] * navio.num_pilhas
+                                  + navio.atribuicao[c.id][1]
+                                  for c in navio.allocated))
+
+    def distancia(self, outra):
+        """Quantos contêineres estão em pilhas diferentes (ou só numa das soluções)."""
+        mapa = dict(zip(outra.ids, outra.pilhas))
+        dif = 0
+        for cid, p in zip(self.ids, self.pilhas):
+            if mapa.pop(cid, None) != p:
+                dif += 1
+        return dif + len(mapa)
+
+
+class PoolElite:
+    """
+    Mantém até `capacidade` soluções de elite e até `capacidade_vistos`
+    hashes de configurações já visitadas, em ordem LRU. Com o pool cheio,
+    uma solução nova com score maior ou igual ao da pior entra no lugar da
+    usada há mais tempo entre as de pior score; como quase todos os
+    candidatos empatam no número de alocações, isso mantém o pool girando.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_ELITE, capacidade_vistos=CAPACIDADE_VISTOS):
+        self.capacidade = capacidade
+        self.capacidade_vistos = capacidade_vistos
+        self._elite = OrderedDict()   # hash -> SolucaoCompacta, do menos ao mais recente
+        self._vistos = OrderedDict()  # hash -> None
+        self._usadas = set()          # elites já usadas em reinícios desta rodada
+        self.duplicatas = 0
+
+    def __len__(self):
+        return len(self._elite)
+
+    def ja_visto(self, h):
+        """Registra o hash e informa se ele já havia sido visitado."""
+        if h in self._vistos:
+            self._vistos.move_to_end(h)
+            self.duplicatas += 1
+            return True
+        self._vistos[h] = None
+        if len(self._vistos) > self.capacidade_vistos:
+            self._vistos.popitem(last=False)
+        return False
+
+    def adicionar(self, navio, score):
+        """Insere a solução se ela for nova e boa o bastante; retorna se entrou."""
+        h = navio.hash
+        if h in self._elite:
+            self._elite.move_to_end(h)
+            return False
+        if len(self._elite) >= self.capacidade:
+            # primeira ocorrência do menor score = a menos recente entre as piores
+            pior = min(self._elite.values(), key=lambda s: s.score)
+            if score < pior.score:
+                return False
+            del self._elite[pior.hash]
+            self._usadas.discard(pior.hash)
+        self._elite[h] = SolucaoCompacta(navio, score)
+        return True
+
+    def diversa(self, referencia):
+        """
+        Escolhe, entre as soluções de elite diferentes de `referencia` (um
+        navio) e ainda não usadas em reinícios, a mais distante dela; no
+        empate, a de maior score. Quando todas já foram usadas, a rodada
+        recomeça, de modo que reinícios seguidos percorrem o pool.
+        """
+        ref = SolucaoCompacta(referencia, None)
+        candidatas = [s for h, s in self._elite.items() if h != ref.hash]
+        if not candidatas:
+            return None
+        novas = [s for s in candidatas if s.hash not in self._usadas]
+        if not novas:
+            self._usadas.clear()
+            novas = candidatas
+        escolhida = max(novas, key=lambda s: (s.distancia(ref), s.score))
+        self._usadas.add(escolhida.hash)
+        self._elite.move_to_end(escolhida.hash)
+        return escolhida
+
+    def restaurar(self, solucao, navio, por_id):
+        """Reconstrói `solucao` num navio vazio, usando `por_id` (id -> Container)."""
+        for cid, p in zip(solucao.ids, solucao.pilhas):
+            x, y = divmod(p, navio.num_pilhas)
+            navio.alocar(por_id[cid], x, y)
+        return navio
@@ -0,0 +1,203 @@
+"""
+Armazenamento dos resultados dos experimentos em SQLite.
+
+Cada execução é acrescentada à tabela `execucoes`; um trigger mantém a tabela
+`agregados` (somas por configuração, ver CHAVES) atualizada a cada inserção,
+de modo que os relatórios leem só as médias já calculadas em vez de
+reagrupar todas as execuções. Bancos e CSVs gravados com um esquema antigo
+são migrados ao abrir: colunas novas recebem o valor de PADROES.
+"""
+import csv
+import os
+import sqlite3
+
+OUTPUT_DB = 'results.db'
+
+# Colunas de results.csv / execucoes, na ordem do CSV, com o tipo SQL
+_TIPOS = {
+    'instancia': 'TEXT NOT NULL',
+    'max_iter': 'INTEGER NOT NULL',
+    'perturb_size': 'INTEGER NOT NULL',
+    'adaptativo': 'INTEGER NOT NULL',
+    'pool_elite': 'INTEGER NOT NULL',
+    'tempo_limite': 'REAL NOT NULL',
+    'repeticao': 'INTEGER',
+    'tempo_s': 'REAL',
+    'taxa_ocupacao': 'REAL',
+    'containers_alocados': 'INTEGER',
+    'cg_long': 'REAL',
+    'cg_trans': 'REAL',
+    'desvio_peso': 'REAL',
+    'limite': 'INTEGER',
+    'gap': 'REAL',
+}
+COLUNAS = tuple(_TIPOS)
+
+# Valor de colunas ausentes em CSVs/bancos antigos (None = desconhecido).
+# Execuções antigas usavam perturbação fixa, sem pool e sem tempo limite
+# (tempo_limite = 0 significa sem limite).
+PADROES = {'adaptativo': 0, 'pool_elite': 0, 'tempo_limite': 0.0,
+           'limite': None, 'gap': None}
+
+# Configuração que identifica um grupo em `agregados`: execuções adaptativas,
+# com pool ou com tempo limite não se misturam às de perturbação fixa
+CHAVES = ('instancia', 'max_iter', 'perturb_size', 'adaptativo', 'pool_elite', 'tempo_limite')
+
+# Somas mantidas por grupo: nome -> expressão sobre a linha inserida (NEW)
+_SOMAS = {
+    'n': '1',
+    'soma_tempo': 'NEW.tempo_s',
+    'soma_qualidade': 'NEW.taxa_ocupacao',
+    'soma_containers': 'NEW.containers_alocados',
+    # limite/gap só existem nas execuções gravadas depois que foram adicionados
+    'n_gap': '(NEW.gap IS NOT NULL)',
+    'soma_limite': 'COALESCE(NEW.limite, 0)',
+    'soma_gap': 'COALESCE(NEW.gap, 0)',
+}
+
+
+def _sql_padrao(valor):
+    if valor is None:
+        return 'NULL'
+    return repr(valor)
+
+
+def _colunas_tabela(conn, tabela):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({tabela})")]
+
+
+def _criar_agregados(conn):
+    chaves = ', '.join(f"{c} {_TIPOS[c]}" for c in CHAVES)
+    somas = ', '.join(f"{s} REAL NOT NULL" for s in _SOMAS)
+    conn.execute(
+        f"CREATE TABLE agregados ({chaves}, {somas}, PRIMARY KEY ({', '.join(CHAVES)}))"
+    )
+    # reconstrói as somas a partir das execuções já gravadas
+    somas = ', '.join(f"SUM({e.replace('NEW.', '')})" for e in _SOMAS.values())
+    conn.execute(
+        f"""INSERT INTO agregados ({', '.join(CHAVES)}, {', '.join(_SOMAS)})
+            SELECT {', '.join(CHAVES)}, {somas}
+            FROM execucoes GROUP BY {', '.join(CHAVES)} ORDER BY MIN(rowid)"""
+    )
+
+
+def _criar_trigger(conn):
+    novos = ', '.join(f"NEW.{c}" for c in CHAVES)
+    conn.execute(
+        f"""CREATE TRIGGER IF NOT EXISTS trg_execucoes_agregados
+            AFTER INSERT ON execucoes
+            BEGIN
+                INSERT INTO agregados ({', '.join(CHAVES)}, {', '.join(_SOMAS)})
+                VALUES ({novos}, {', '.join(_SOMAS.values())})
+                ON CONFLICT ({', '.join(CHAVES)}) DO UPDATE SET
+                    {', '.join(f'{s} = {s} + excluded.{s}' for s in _SOMAS)};
+            END"""
+    )
+
+
+def conectar(caminho=OUTPUT_DB):
+    """Abre (e cria ou migra, se preciso) o banco de resultados."""
+    conn = sqlite3.connect(caminho)
+    with conn:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS execucoes "
+            f"({', '.join(f'{c} {t}' for c, t in _TIPOS.items())})"
+        )
+        existentes = _colunas_tabela(conn, 'execucoes')
+        for c in COLUNAS:
+            if c not in existentes:
+                tipo = _TIPOS[c]
+                conn.execute(f"ALTER TABLE execucoes ADD COLUMN {c} {tipo} "
+                             f"DEFAULT {_sql_padrao(PADROES.get(c))}")
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_execucoes_config ON execucoes ({', '.join(CHAVES)})"
+        )
+
+        esperadas = list(CHAVES) + list(_SOMAS)
+        if _colunas_tabela(conn, 'agregados') != esperadas:
+            conn.execute("DROP TRIGGER IF EXISTS trg_execucoes_agregados")
+            conn.execute("DROP TABLE IF EXISTS agregados")
+            _criar_agregados(conn)
+        _criar_trigger(conn)
+    return conn
+
+
+def migrar_csv(caminho_csv):
+    """
+    Reescreve um CSV gravado com um esquema antigo no formato de COLUNAS,
+    preenchendo as colunas novas com PADROES. Não faz nada se já estiver
+    atualizado.
+    """
+    with open(caminho_csv, newline='') as f:
+        reader = csv.DictReader(f)
+        if tuple(reader.fieldnames or ()) == COLUNAS:
+            return False
+        linhas = list(reader)
+
+    temporario = caminho_csv + '.tmp'
+    with open(temporario, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUNAS)
+        for row in linhas:
+            writer.writerow([_valor_csv(row, c) for c in COLUNAS])
+    os.replace(temporario, caminho_csv)
+    return True
+
+
+def _valor_csv(row, coluna):
+    valor = row.get(coluna)
+    if valor is None or valor == '':
+        padrao = PADROES.get(coluna)
+        return '' if padrao is None else padrao
+    return valor
+
+
+def _valor_db(row, coluna):
+    valor = _valor_csv(row, coluna)
+    return None if valor == '' else valor
+
+
+def registrar_execucoes(conn, linhas):
+    """Acrescenta execuções (sequências na ordem de COLUNAS) numa única transação."""
+    placeholders = ', '.join('?' * len(COLUNAS))
+    with conn:
+        conn.executemany(
+            f"INSERT INTO execucoes ({', '.join(COLUNAS)}) VALUES ({placeholders})",
+            linhas,
+        )
+
+
+def importar_csv(conn, caminho_csv, tamanho_bloco=10000):
+    """Importa um results.csv existente (de qualquer esquema), em blocos, para o banco."""
+    total = 0
+    with open(caminho_csv, newline='') as f:
+        reader = csv.DictReader(f)
+        bloco = []
+        for row in reader:
+            bloco.append([_valor_db(row, c) for c in COLUNAS])
+            if len(bloco) >= tamanho_bloco:
+                registrar_execucoes(conn, bloco)
+                total += len(bloco)
+                bloco = []
+        registrar_execucoes(conn, bloco)
+        total += len(bloco)
+    return total
+
+
+def ler_agregados(conn):
+    """
+    Retorna as médias por configuração, na ordem em que cada uma apareceu,
+    como dicts com as CHAVES e tempo_medio, qualidade_media,
+    containers_medios, limite_medio e gap_medio (None se nenhuma execução
+    do grupo registrou limite/gap).
+    """
+    cur = conn.execute(
+        f'''SELECT {', '.join(CHAVES)},
+                  soma_tempo / n, soma_qualidade / n, soma_containers / n,
+                  CASE WHEN n_gap > 0 THEN soma_limite / n_gap END,
+                  CASE WHEN n_gap > 0 THEN soma_gap / n_gap END
+           FROM agregados ORDER BY rowid'''
+    )
+    medias = ('tempo_medio', 'qualidade_media', 'containers_medios',
+              'limite_medio', 'gap_medio')
+    return [dict(zip(CHAVES + medias, row)) for row in cur]
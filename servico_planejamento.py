@@ -0,0 +1,329 @@
+"""
+Serviço local de planejamento de estiva.
+
+Mantém um Pool de processos já aquecido (perfis de navio carregados na
+inicialização de cada worker) e atende pedidos em JSON, um por linha, via
+socket TCP local ou Unix. Pedidos simultâneos são agrupados em lotes antes
+de serem despachados ao Pool, e cada melhoria encontrada pelo ILS é enviada
+ao cliente como solução parcial antes do resultado final.
+
+Pedido:
+    {"id": "p1", "perfil": "vessel_S", "containers": [[0, "40ft", 28], ...],
+     "max_iter": 20, "perturb_size": 2, "tempo_limite": 5.0, "adaptativo": false,
+     "pool_elite": 16}
+    (no lugar de "containers" pode-se enviar "instancia": caminho de um CSV)
+
+Respostas (uma linha JSON cada):
+    {"id": "p1", "evento": "parcial", "iteracao": 3, "alocados": 2700,
+     "posicoes": [[cid, x, y], ...]}
+    {"id": "p1", "evento": "final", "alocados": 2724, "total": 2724,
+     "limite": 2724, "gap": 0.0, "tempo_s": 1.23, "posicoes": [[cid, x, y], ...]}
+    {"id": "p1", "evento": "erro", "mensagem": "..."}
+"""
+import argparse
+import asyncio
+import glob
+import itertools
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+# Diretório com os perfis de navio carregados em cada worker
+PERFIS_DIR = 'bases/navio'
+
+# Endereço padrão do serviço
+HOST = '127.0.0.1'
+PORTA = 8765
+
+# Janela (segundos) e tamanho máximo de cada lote de pedidos
+JANELA_LOTE = 0.01
+LOTE_MAX = 32
+
+# Parâmetros padrão da heurística quando o pedido não os informa
+MAX_ITER = 20
+PERTURB_SIZE = 2
+
+# --- Lado do worker ---
+
+_perfis = {}
+_fila_eventos = None
+
+
+def carregar_perfis(perfis_dir=PERFIS_DIR):
+    """Carrega todos os perfis de navio do diretório, indexados pelo nome do arquivo."""
+    from carregar_vessel import load_vessel_profile
+    perfis = {}
+    for caminho in sorted(glob.glob(os.path.join(perfis_dir, '*.txt'))):
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        perfis[nome] = load_vessel_profile(caminho)
+    return perfis
+
+
+def _iniciar_worker(perfis_dir, fila_eventos):
+    """Initializer do Pool: importa a heurística e carrega os perfis uma única vez."""
+    global _perfis, _fila_eventos
+    import heuristica_distribuicao  # noqa: F401  (aquece o import no worker)
+    _perfis = carregar_perfis(perfis_dir)
+    _fila_eventos = fila_eventos
+
+
+def _containers_do_pedido(pedido):
+    from heuristica_distribuicao import Container
+    from carregar_containers_csv import carregar_containers_csv
+    if 'containers' in pedido:
+        return [Container(int(cid), tipo, int(peso))
+                for cid, tipo, peso in pedido['containers']]
+    if 'instancia' in pedido:
+        return carregar_containers_csv(pedido['instancia'])
+    raise ValueError("Pedido sem 'containers' nem 'instancia'")
+
+
+def _posicoes(navio):
+    # containers são compartilhados entre clones: a posição vem do próprio navio
+    return [[c.id, *navio.atribuicao[c.id]] for c in navio.allocated]
+
+
+def resolver_pedido(pedido, perfis, emitir):
+    """
+    Executa a heurística para um pedido, publica os eventos via `emitir` e
+    retorna a solução (Navio). Separado do worker para poder ser usado
+    diretamente, sem Pool nem socket.
+    """
+    from heuristica_distribuicao import Navio, heuristica_distribuicao
+    from solucao_exata import limite_superior, calcular_gap
+    from pool_solucoes import PoolElite
+
+    pid = pedido.get('id')
+    nome_perfil = pedido.get('perfil')
+    if nome_perfil not in perfis:
+        raise ValueError(f"Perfil de navio desconhecido: {nome_perfil}")
+
+    containers = _containers_do_pedido(pedido)
+
+    def ao_melhorar(iteracao, best, best_score):
+        emitir({'id': pid, 'evento': 'parcial', 'iteracao': iteracao,
+                'alocados': best_score, 'posicoes': _posicoes(best)})
+
+    inicio = time.perf_counter()
+    navio = Navio(perfis[nome_perfil])
+    limite = limite_superior(containers, perfis[nome_perfil])
+    best = heuristica_distribuicao(
+        containers, navio,
+        int(pedido.get('max_iter', MAX_ITER)),
+        int(pedido.get('perturb_size', PERTURB_SIZE)),
+        tempo_limite=pedido.get('tempo_limite'),
+        callback=ao_melhorar,
+        limite=limite,
+        adaptativo=bool(pedido.get('adaptativo', False)),
+        pool=PoolElite(pedido['pool_elite']) if pedido.get('pool_elite') else None,
+    )
+    emitir({
+        'id': pid, 'evento': 'final',
+        'alocados': len(best.allocated), 'total': len(containers),
+        'limite': limite, 'gap': calcular_gap(len(best.allocated), limite),
+        'tempo_s': round(time.perf_counter() - inicio, 4),
+        'posicoes': _posicoes(best),
+    })
+    return best
+
+
+def _executar_pedido(pedido):
+    """Ponto de entrada no worker; erros viram eventos em vez de derrubar o lote."""
+    chave = pedido.get('_chave')
+
+    def emitir(evento):
+        # ecoa `_chave` para que o servidor entregue o evento ao assinante certo
+        _fila_eventos.put(dict(evento, _chave=chave))
+
+    try:
+        resolver_pedido(pedido, _perfis, emitir)
+    except Exception as exc:
+        emitir({'id': pedido.get('id'), 'evento': 'erro', 'mensagem': str(exc)})
+
+
+# --- Lado do servidor ---
+
+class ServicoPlanejamento:
+    """Servidor asyncio que repassa pedidos em lote a um Pool de workers."""
+
+    def __init__(self, perfis_dir=PERFIS_DIR, processos=None,
+                 janela_lote=JANELA_LOTE, lote_max=LOTE_MAX):
+        self.perfis_dir = perfis_dir
+        self.processos = processos
+        self.janela_lote = janela_lote
+        self.lote_max = lote_max
+        self._pool = None
+        self._fila_eventos = None
+        self._leitor = None
+        self._pendentes = None
+        self._assinantes = {}
+        self._ids = itertools.count()
+        self._despachante = None
+        self._loop = None
+
+    async def iniciar(self):
+        self._loop = asyncio.get_running_loop()
+        self._pendentes = asyncio.Queue()
+        self._fila_eventos = multiprocessing.Queue()
+        self._pool = multiprocessing.Pool(
+            processes=self.processos,
+            initializer=_iniciar_worker,
+            initargs=(self.perfis_dir, self._fila_eventos),
+        )
+        self._leitor = threading.Thread(target=self._ler_eventos, daemon=True)
+        self._leitor.start()
+        self._despachante = asyncio.create_task(self._despachar())
+
+    async def encerrar(self):
+        if self._despachante is not None:
+            self._despachante.cancel()
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+        if self._fila_eventos is not None:
+            self._fila_eventos.put(None)
+            self._leitor.join()
+
+    def _ler_eventos(self):
+        """Thread que drena a fila dos workers e entrega cada evento ao loop."""
+        while True:
+            evento = self._fila_eventos.get()
+            if evento is None:
+                break
+            self._loop.call_soon_threadsafe(self._entregar, evento)
+
+    def _entregar(self, evento):
+        fila = self._assinantes.get(evento.get('_chave'))
+        if fila is not None:
+            fila.put_nowait(evento)
+
+    async def _despachar(self):
+        """Agrupa pedidos que chegam dentro de `janela_lote` e os envia juntos ao Pool."""
+        while True:
+            lote = [await self._pendentes.get()]
+            limite = self._loop.time() + self.janela_lote
+            while len(lote) < self.lote_max:
+                restante = limite - self._loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._pendentes.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            self._pool.map_async(_executar_pedido, lote, chunksize=1)
+
+    async def submeter(self, pedido):
+        """
+        Enfileira um pedido e produz seus eventos (parciais e final/erro).
+        O campo interno `_chave` identifica o pedido mesmo se `id` se repetir.
+        """
+        chave = next(self._ids)
+        fila = asyncio.Queue()
+        self._assinantes[chave] = fila
+        pedido = dict(pedido, _chave=chave)
+        pedido.setdefault('id', chave)
+        await self._pendentes.put(pedido)
+        try:
+            while True:
+                evento = await fila.get()
+                evento.pop('_chave', None)
+                yield evento
+                if evento['evento'] in ('final', 'erro'):
+                    break
+        finally:
+            del self._assinantes[chave]
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    pedido = json.loads(linha)
+                except json.JSONDecodeError as exc:
+                    writer.write((json.dumps({'evento': 'erro', 'mensagem': str(exc)}) + '\n').encode())
+                    await writer.drain()
+                    continue
+                async for evento in self.submeter(pedido):
+                    writer.write((json.dumps(evento) + '\n').encode())
+                    await writer.drain()
+        finally:
+            writer.close()
+
+    async def servir(self, host=HOST, porta=PORTA, unix=None):
+        await self.iniciar()
+        try:
+            if unix:
+                server = await asyncio.start_unix_server(self._atender, path=unix)
+            else:
+                server = await asyncio.start_server(self._atender, host, porta)
+            print(f">>> Serviço de planejamento em {unix or f'{host}:{porta}'} <<<")
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.encerrar()
+
+
+# --- Cliente ---
+
+async def planejar(pedido, host=HOST, porta=PORTA, unix=None):
+    """Cliente: envia um pedido e produz os eventos recebidos até o final."""
+    if unix:
+        reader, writer = await asyncio.open_unix_connection(unix)
+    else:
+        reader, writer = await asyncio.open_connection(host, porta)
+    try:
+        writer.write((json.dumps(pedido) + '\n').encode())
+        await writer.drain()
+        while True:
+            linha = await reader.readline()
+            if not linha:
+                break
+            evento = json.loads(linha)
+            yield evento
+            if evento.get('evento') in ('final', 'erro'):
+                break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def planejar_local(pedido, perfis=None, perfis_dir=PERFIS_DIR):
+    """
+    Substituto local do cliente: resolve o pedido no próprio processo e
+    retorna a lista de eventos que o serviço teria enviado.
+    """
+    if perfis is None:
+        perfis = carregar_perfis(perfis_dir)
+    eventos = []
+    try:
+        resolver_pedido(pedido, perfis, eventos.append)
+    except Exception as exc:
+        eventos.append({'id': pedido.get('id'), 'evento': 'erro', 'mensagem': str(exc)})
+    return eventos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serviço local de planejamento de estiva.')
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--porta', type=int, default=PORTA)
+    parser.add_argument('--unix', default=None, help='caminho de socket Unix (substitui host/porta)')
+    parser.add_argument('--perfis-dir', default=PERFIS_DIR)
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--janela-lote', type=float, default=JANELA_LOTE)
+    parser.add_argument('--lote-max', type=int, default=LOTE_MAX)
+    args = parser.parse_args(argv)
+
+    servico = ServicoPlanejamento(args.perfis_dir, args.processos,
+                                  args.janela_lote, args.lote_max)
+    try:
+        asyncio.run(servico.servir(args.host, args.porta, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
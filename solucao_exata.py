@@ -0,0 +1,162 @@
+"""
+Limite superior e busca exata (branch-and-bound) para o problema de alocação.
+
+O limite vale para qualquer solução: serve para medir o gap da ILS e para
+encerrar a ILS assim que ela o atinge. O branch-and-bound só é viável em
+instâncias reduzidas e usa as mesmas restrições de Navio.verificar_restricoes,
+verificadas a cada inserção, na ordem da lista de contêineres. Como o CG é
+checado nos estados intermediários, o resultado é ótimo apenas para essa
+ordem de inserção; outra ordem pode alocar mais contêineres.
+"""
+from heuristica_distribuicao import Navio
+
+# Tamanho máximo de instância para a qual o modo exato é tentado
+LIMITE_EXATO = 40
+
+# Orçamento padrão de nós do branch-and-bound
+MAX_NOS = 200000
+
+
+def _pilhas(vessel):
+    """Lista (x, y, x_norm, y_norm) de todas as pilhas do navio."""
+    return [(x, y, x / (vessel.num_baias - 1), y / (vessel.num_pilhas - 1))
+            for x in range(vessel.num_baias)
+            for y in range(vessel.num_pilhas)]
+
+
+def limite_superior(containers, vessel):
+    """
+    Limite superior do número de contêineres alocáveis, baseado apenas em
+    capacidade e peso, o menor entre:
+    1) o total de contêineres;
+    2) a capacidade em altura (pilhas × altura_max);
+    3) quantos dos mais leves cabem no peso somado de todas as pilhas;
+    4) pilhas × quantos dos mais leves cabem numa única pilha.
+
+    A janela de CG só entra no caso degenerado: num navio vazio o primeiro
+    contêiner define sozinho o CG, então se nenhuma pilha está dentro da
+    janela nada pode ser alocado e o limite é 0. Não há corte de CG mais
+    forte porque Navio.verificar_restricoes checa o CG só na inserção: as
+    remoções da perturbação podem deixar o CG final fora da janela, e um
+    corte sobre o estado final não limitaria as soluções da ILS.
+
+    Com os perfis TXT (peso_max_pilha=999999) os itens 3 e 4 não cortam e o
+    limite fica min(contêineres, pilhas × altura_max).
+    """
+    n = len(containers)
+    if n == 0:
+        return 0
+
+    num_pilhas = vessel.num_baias * vessel.num_pilhas
+    tol = vessel.limite_grav_long
+    if not any(0.5 - tol <= xn <= 0.5 + tol and 0.5 - tol <= yn <= 0.5 + tol
+               for _, _, xn, yn in _pilhas(vessel)):
+        return 0
+
+    pesos = sorted(c.peso for c in containers)
+    acumulado = [0]
+    for p in pesos:
+        acumulado.append(acumulado[-1] + p)
+
+    def max_prefixo(cap):
+        # maior k com soma dos k mais leves <= cap
+        k = 0
+        while k < n and acumulado[k + 1] <= cap:
+            k += 1
+        return k
+
+    k_peso = max_prefixo(num_pilhas * vessel.peso_max_pilha)
+    por_pilha = min(vessel.altura_max, max_prefixo(vessel.peso_max_pilha))
+
+    return min(n, num_pilhas * vessel.altura_max, k_peso, num_pilhas * por_pilha)
+
+
+def calcular_gap(alocados, limite):
+    """Gap relativo ao limite superior, em [0, 1]."""
+    if limite <= 0:
+        return 0.0
+    return (limite - alocados) / limite
+
+
+def branch_and_bound(containers, vessel, max_nos=MAX_NOS):
+    """
+    Busca exata em profundidade: para cada contêiner (na ordem dada) tenta
+    cada pilha viável, da que deixa o CG mais próximo do centro para a mais
+    distante, e por fim a opção de não alocá-lo. Poda quando o número já
+    alocado mais os restantes não supera a melhor solução, e encerra ao
+    atingir o limite superior.
+
+    Retorna (navio, otimo_na_ordem): `otimo_na_ordem` é True se a busca
+    terminou, ou seja, nenhuma atribuição que insira os contêineres nesta
+    ordem aloca mais. Não é prova de otimalidade da instância: o gap deve
+    continuar sendo medido contra limite_superior. É False se `max_nos` se
+    esgotou, caso em que o navio é a melhor solução encontrada.
+    """
+    n = len(containers)
+    limite = limite_superior(containers, vessel)
+    pilhas = _pilhas(vessel)
+    tol = vessel.limite_grav_long
+    lo, hi = 0.5 - tol, 0.5 + tol
+
+    ocup = [0] * len(pilhas)
+    peso = [0] * len(pilhas)
+    atrib = [None] * n
+    estado = {'tot': 0, 'ml': 0.0, 'mt': 0.0, 'nos': 0}
+    melhor = {'qtd': 0, 'atrib': [None] * n}
+
+    class _Esgotado(Exception):
+        pass
+
+    def buscar(i, qtd):
+        if qtd > melhor['qtd']:
+            melhor['qtd'] = qtd
+            melhor['atrib'] = atrib[:i] + [None] * (n - i)
+        if melhor['qtd'] >= limite or i == n or qtd + (n - i) <= melhor['qtd']:
+            return
+        estado['nos'] += 1
+        if estado['nos'] > max_nos:
+            raise _Esgotado
+
+        w = containers[i].peso
+        tot = estado['tot'] + w
+        ml, mt = estado['ml'], estado['mt']
+        candidatas = []
+        for s, (_, _, xn, yn) in enumerate(pilhas):
+            if ocup[s] >= vessel.altura_max or peso[s] + w > vessel.peso_max_pilha:
+                continue
+            cg_l = (ml + w * xn) / tot
+            cg_t = (mt + w * yn) / tot
+            if lo <= cg_l <= hi and lo <= cg_t <= hi:
+                candidatas.append((abs(cg_l - 0.5) + abs(cg_t - 0.5), s))
+        candidatas.sort()
+
+        for _, s in candidatas:
+            xn, yn = pilhas[s][2], pilhas[s][3]
+            ocup[s] += 1
+            peso[s] += w
+            estado['tot'] = tot
+            estado['ml'] = ml + w * xn
+            estado['mt'] = mt + w * yn
+            atrib[i] = s
+            buscar(i + 1, qtd + 1)
+            ocup[s] -= 1
+            peso[s] -= w
+            estado['tot'] = tot - w
+            estado['ml'], estado['mt'] = ml, mt
+            atrib[i] = None
+            if melhor['qtd'] >= limite:
+                return
+
+        buscar(i + 1, qtd)
+
+    otimo_na_ordem = True
+    try:
+        buscar(0, 0)
+    except _Esgotado:
+        otimo_na_ordem = False
+
+    navio = Navio(vessel)
+    for c, s in zip(containers, melhor['atrib']):
+        if s is not None:
+            navio.alocar(c, pilhas[s][0], pilhas[s][1])
+    return navio, otimo_na_ordem
@@ -0,0 +1,48 @@
+import csv
+
+import generate_containers as gc
+
+_TXT = """# Parameters: nPorts nContainers
+2 4
+# Transport type: id length=(20,40) weight type=(DC,RC,HC,HR)
+0 20 10 DC
+1 40 30 DC
+# Container: startPort endPort typeId [bay stack tier slot]
+0 1 0
+0 1 1
+1 2 1
+1 2 0
+"""
+
+
+def _ler(caminho):
+    with open(caminho, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_sementes_nao_se_repetem_entre_replicas_e_sementes_vizinhas(tmp_path):
+    pasta = tmp_path / 'txt' / 'Vessel_S'
+    pasta.mkdir(parents=True)
+    for nome in ('VSLow1', 'VSMed1', 'VSHigh1'):
+        (pasta / f'{nome}.txt').write_text(_TXT)
+
+    sementes = [t[2] for s in (0, 1) for t in gc.listar_tarefas(
+        base_dir=str(tmp_path / 'txt'), pastas=['Vessel_S'], saida_dir=str(tmp_path / 'csv'),
+        seed=s, copias=3)]
+    assert len(sementes) == 2 * 3 * 3
+    assert len(sementes) == len(set(sementes))
+
+
+def test_mesma_semente_gera_mesmo_manifesto_escalado(tmp_path):
+    txt = tmp_path / 'X.txt'
+    txt.write_text(_TXT)
+    a, b = tmp_path / 'a.csv', tmp_path / 'b.csv'
+
+    assert gc.processar_arquivo(str(txt), str(a), seed=42, multiplicador=2.5) == 10
+    gc.processar_arquivo(str(txt), str(b), seed=42, multiplicador=2.5)
+    linhas = _ler(a)
+    assert linhas == _ler(b)
+    assert [r['tipo'] for r in linhas[:4]] == ['20ft', '40ft', '40ft', '20ft']
+    for r in linhas:
+        nominal = 10 if r['tipo'] == '20ft' else 30
+        assert nominal * 0.9 - 1 <= int(r['peso']) <= nominal * 1.1
@@ -0,0 +1,128 @@
+import random
+
+from carregar_vessel import VesselProfile
+import heuristica_distribuicao as hd
+from heuristica_distribuicao import (Container, Navio, PerturbacaoAdaptativa,
+                                     heuristica_distribuicao)
+from pool_solucoes import PoolElite, hash_zobrist
+
+
+def _perfil():
+    return VesselProfile(
+        num_baias=5, num_pilhas=5, altura_max=3,
+        capacidade_20ft=3, capacidade_40ft=3,
+        peso_max_pilha=60, limite_grav_long=0.1, limite_grav_trans=0.1,
+    )
+
+
+def _containers(n=80, seed=7):
+    rng = random.Random(seed)
+    return [Container(i, '40ft', rng.randint(5, 30)) for i in range(n)]
+
+
+def test_estado_da_solucao_consistente_com_atribuicao():
+    random.seed(3)
+    perfil = _perfil()
+    best = heuristica_distribuicao(_containers(), Navio(perfil), max_iter=15,
+                                   perturb_size=3, adaptativo=True, pool=PoolElite(4))
+
+    assert set(best.atribuicao) == {c.id for c in best.allocated}
+    ocupacao = {}
+    peso = {}
+    for c in best.allocated:
+        pos = best.atribuicao[c.id]
+        ocupacao[pos] = ocupacao.get(pos, 0) + 1
+        peso[pos] = peso.get(pos, 0) + c.peso
+    assert ocupacao == best.positions
+    assert max(ocupacao.values()) <= perfil.altura_max
+    assert max(peso.values()) <= perfil.peso_max_pilha
+    assert best.hash == hash_zobrist(best)
+
+
+def test_clone_reproduz_atribuicao_mesmo_com_position_alterado():
+    navio = Navio(_perfil())
+    cs = _containers(3)
+    for c, (x, y) in zip(cs, [(2, 2), (1, 3), (3, 1)]):
+        navio.alocar(c, x, y)
+    # outro navio move o mesmo objeto Container
+    Navio(_perfil()).alocar(cs[0], 0, 0)
+
+    clone = navio.clone()
+    assert clone.atribuicao == navio.atribuicao
+    assert clone.hash == navio.hash
+
+
+def test_tempo_limite_respeitado_na_busca_local():
+    import time
+
+    random.seed(4)
+    inicio = time.perf_counter()
+    best = heuristica_distribuicao(_containers(400, seed=9), Navio(_perfil()), max_iter=1000,
+                                   perturb_size=3, tempo_limite=0.2)
+    assert time.perf_counter() - inicio < 1.0
+    assert best.allocated
+
+
+def _sem_operar(navio, forca):
+    return navio
+
+
+def test_pesos_favorecem_operador_com_mais_recompensa():
+    ctrl = PerturbacaoAdaptativa(operadores={'bom': _sem_operar, 'ruim': _sem_operar},
+                                 segmento=4)
+    for _ in range(2):
+        ctrl.registrar('bom', 11, 10)
+        ctrl.registrar('ruim', 9, 10)
+    assert ctrl.pesos['bom'] > 1.0 > ctrl.pesos['ruim'] >= ctrl.peso_min
+
+
+def test_forca_sobe_sem_melhora_e_desce_acima_da_taxa_alvo():
+    ctrl = PerturbacaoAdaptativa(forca_inicial=2, forca_min=1, forca_max=4,
+                                 operadores={'op': _sem_operar}, segmento=5, taxa_alvo=0.2)
+    forcas = []
+    for melhora in [False] * 4 + [True] * 5:
+        for _ in range(ctrl.segmento):
+            ctrl.registrar('op', 11 if melhora else 10, 10)
+        forcas.append(ctrl.forca)
+    assert forcas == [3, 4, 4, 4, 3, 2, 1, 1, 1]
+
+
+def _navio_cheio():
+    navio = Navio(_perfil())
+    for c, (x, y) in zip(_containers(12), [(x, y) for x in range(4) for y in range(3)]):
+        navio.alocar(c, x, y)
+    return navio
+
+
+def _removidos(monkeypatch):
+    removidos = []
+    monkeypatch.setattr(hd, '_realocar', lambda navio, removed: removidos.extend(removed))
+    return removidos
+
+
+def test_perturb_baia_remove_de_uma_unica_baia(monkeypatch):
+    removidos = _removidos(monkeypatch)
+    for semente in range(10):
+        random.seed(semente)
+        navio = _navio_cheio()
+        antes = dict(navio.atribuicao)
+        del removidos[:]
+        hd.perturb_baia(navio, 2)
+        assert len(removidos) == 2
+        assert len({antes[c.id][0] for c in removidos}) == 1
+
+
+def test_perturb_pilha_pesada_remove_primeiro_da_pilha_mais_pesada(monkeypatch):
+    removidos = _removidos(monkeypatch)
+    navio = Navio(_perfil())
+    leves = [Container(i, '40ft', 5) for i in range(4)]
+    pesados = [Container(10 + i, '40ft', 20) for i in range(2)]
+    for c in leves:
+        navio.alocar(c, c.id, 0)
+    for c in pesados:
+        navio.alocar(c, 2, 2)
+
+    hd.perturb_pilha_pesada(navio, 3)
+    # a pilha mais pesada (2 x 20) esvazia antes de tocar nas leves (1 x 5)
+    assert len(removidos) == 3
+    assert set(pesados) < set(removidos)
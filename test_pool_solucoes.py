@@ -0,0 +1,85 @@
+from carregar_vessel import VesselProfile
+from heuristica_distribuicao import Container, Navio
+from pool_solucoes import PoolElite, hash_zobrist
+
+
+def _perfil():
+    return VesselProfile(
+        num_baias=5, num_pilhas=5, altura_max=3,
+        capacidade_20ft=3, capacidade_40ft=3,
+        peso_max_pilha=60, limite_grav_long=0.1, limite_grav_trans=0.1,
+    )
+
+
+CONTAINERS = [Container(i, '40ft', 10 + i) for i in range(6)]
+
+
+def _navio(*posicoes):
+    """Navio com CONTAINERS[i] na pilha posicoes[i] (None = não alocado)."""
+    navio = Navio(_perfil())
+    for c, pos in zip(CONTAINERS, posicoes):
+        if pos is not None:
+            navio.alocar(c, *pos)
+    return navio
+
+
+def test_pool_cheio_expulsa_menor_score_e_no_empate_o_menos_recente():
+    pool = PoolElite(capacidade=3)
+    a, b, c = _navio((0, 0)), _navio((1, 1)), _navio((2, 2))
+    assert pool.adicionar(a, 1) and pool.adicionar(b, 1) and pool.adicionar(c, 2)
+
+    # empate com o pior score: sai `a`, o menos recente entre os de score 1
+    d = _navio((3, 3))
+    assert pool.adicionar(d, 1)
+    assert set(pool._elite) == {b.hash, c.hash, d.hash}
+
+    # reinserir `b` o torna recente; o próximo empate expulsa `d`
+    assert not pool.adicionar(b, 1)
+    e = _navio((4, 4))
+    assert pool.adicionar(e, 1)
+    assert set(pool._elite) == {b.hash, c.hash, e.hash}
+
+    # score maior expulsa um dos piores; score menor não entra
+    f = _navio((0, 1), (0, 2))
+    assert pool.adicionar(f, 3)
+    assert set(pool._elite) == {c.hash, e.hash, f.hash}
+    assert not pool.adicionar(_navio((1, 2)), 0)
+    assert len(pool) == 3
+
+
+def test_vistos_nunca_excede_capacidade():
+    pool = PoolElite(capacidade_vistos=5)
+    for h in range(20):
+        assert not pool.ja_visto(h)
+        assert len(pool._vistos) <= 5
+    # os mais antigos foram esquecidos, os recentes continuam registrados
+    assert not pool.ja_visto(0)
+    assert pool.ja_visto(19)
+    assert len(pool._vistos) == 5
+
+
+def test_diversa_escolhe_elite_diferente_da_melhor_e_alterna_reinicios():
+    pool = PoolElite(capacidade=4)
+    melhor = _navio((0, 0), (1, 1), (2, 2))
+    perto = _navio((0, 0), (1, 1), (2, 3))
+    longe = _navio((4, 4), (3, 3), (2, 2))
+    for navio in (melhor, perto, longe):
+        pool.adicionar(navio, 3)
+
+    assert pool.diversa(melhor).hash == longe.hash
+    # o reinício seguinte não volta à mesma elite
+    assert pool.diversa(melhor).hash == perto.hash
+    assert pool.diversa(melhor).hash == longe.hash
+    assert PoolElite().diversa(melhor) is None
+
+
+def test_restaurar_reproduz_atribuicao_e_hash():
+    pool = PoolElite()
+    original = _navio((0, 0), None, (2, 4), (2, 4), (4, 1))
+    pool.adicionar(original, 4)
+    solucao = pool._elite[original.hash]
+
+    por_id = {c.id: c for c in CONTAINERS}
+    restaurado = pool.restaurar(solucao, Navio(_perfil()), por_id)
+    assert restaurado.atribuicao == original.atribuicao
+    assert restaurado.hash == original.hash == hash_zobrist(restaurado)
@@ -0,0 +1,69 @@
+import csv
+import sqlite3
+
+import resultados_db
+
+_CABECALHO_ANTIGO = ['instancia', 'max_iter', 'perturb_size', 'repeticao', 'tempo_s',
+                     'taxa_ocupacao', 'containers_alocados', 'cg_long', 'cg_trans',
+                     'desvio_peso']
+
+
+def _linha(instancia='VS', tempo=1.0, alocados=10, limite=10, gap=0.0, **extra):
+    row = dict(zip(_CABECALHO_ANTIGO, [instancia, 20, 2, 1, tempo, 100.0, alocados,
+                                        0.5, 0.5, 1.0]))
+    row.update(limite=limite, gap=gap, **extra)
+    return [row.get(c, resultados_db.PADROES.get(c)) for c in resultados_db.COLUNAS]
+
+
+def test_agregados_atualizados_a_cada_execucao(tmp_path):
+    conn = resultados_db.conectar(str(tmp_path / 'r.db'))
+    resultados_db.registrar_execucoes(conn, [_linha(tempo=1.0, alocados=8, gap=0.2)])
+    resultados_db.registrar_execucoes(conn, [_linha(tempo=3.0, alocados=10, gap=0.0)])
+
+    [agg] = resultados_db.ler_agregados(conn)
+    assert agg['tempo_medio'] == 2.0
+    assert agg['containers_medios'] == 9.0
+    assert agg['limite_medio'] == 10.0
+    assert abs(agg['gap_medio'] - 0.1) < 1e-9
+
+
+def test_migra_csv_e_banco_do_esquema_antigo(tmp_path):
+    caminho_csv = tmp_path / 'results.csv'
+    with open(caminho_csv, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(_CABECALHO_ANTIGO)
+        writer.writerow(['VS', 20, 2, 1, 2.0, 100, 10, 0.5, 0.5, 1.0])
+
+    # banco criado com o esquema antigo, sem limite/gap
+    caminho_db = str(tmp_path / 'r.db')
+    antigo = sqlite3.connect(caminho_db)
+    antigo.execute(f"CREATE TABLE execucoes ({', '.join(_CABECALHO_ANTIGO)})")
+    antigo.execute("CREATE TABLE agregados (instancia, max_iter, perturb_size, n, "
+                   "soma_tempo, soma_qualidade, soma_containers)")
+    antigo.commit()
+    antigo.close()
+
+    assert resultados_db.migrar_csv(str(caminho_csv))
+    assert not resultados_db.migrar_csv(str(caminho_csv))
+    with open(caminho_csv, newline='') as f:
+        assert tuple(next(csv.reader(f))) == resultados_db.COLUNAS
+
+    conn = resultados_db.conectar(caminho_db)
+    resultados_db.importar_csv(conn, str(caminho_csv))
+    resultados_db.registrar_execucoes(conn, [_linha(tempo=4.0, gap=0.5)])
+    [agg] = resultados_db.ler_agregados(conn)
+    assert agg['tempo_medio'] == 3.0
+    # só a execução nova tem gap
+    assert agg['gap_medio'] == 0.5
+
+
+def test_execucoes_adaptativas_nao_se_misturam_as_fixas(tmp_path):
+    conn = resultados_db.conectar(str(tmp_path / 'r.db'))
+    resultados_db.registrar_execucoes(conn, [
+        _linha(tempo=1.0, adaptativo=0),
+        _linha(tempo=5.0, adaptativo=1),
+        _linha(tempo=7.0, adaptativo=1, pool_elite=8),
+    ])
+    tempos = {(a['adaptativo'], a['pool_elite']): a['tempo_medio']
+              for a in resultados_db.ler_agregados(conn)}
+    assert tempos == {(0, 0): 1.0, (1, 0): 5.0, (1, 8): 7.0}
@@ -0,0 +1,75 @@
+import random
+
+from carregar_vessel import VesselProfile
+import servico_planejamento as sp
+
+
+def _perfil():
+    return VesselProfile(
+        num_baias=5, num_pilhas=5, altura_max=3,
+        capacidade_20ft=3, capacidade_40ft=3,
+        peso_max_pilha=60, limite_grav_long=0.1, limite_grav_trans=0.1,
+    )
+
+
+def _pedido():
+    rng = random.Random(7)
+    return {
+        'id': 'p1', 'perfil': 'teste', 'max_iter': 10, 'perturb_size': 3,
+        'containers': [[i, '40ft', rng.randint(5, 30)] for i in range(80)],
+    }
+
+
+def test_final_corresponde_a_solucao_retornada():
+    random.seed(1)
+    eventos = []
+    best = sp.resolver_pedido(_pedido(), {'teste': _perfil()}, eventos.append)
+
+    final = eventos[-1]
+    assert final['evento'] == 'final'
+    assert final['alocados'] == len(best.allocated) == len(final['posicoes'])
+    assert {cid: (x, y) for cid, x, y in final['posicoes']} == best.atribuicao
+
+
+def test_parciais_trazem_posicoes_da_melhor_solucao():
+    random.seed(1)
+    parciais = []
+
+    def emitir(evento):
+        if evento['evento'] == 'parcial':
+            parciais.append(evento)
+
+    sp.resolver_pedido(_pedido(), {'teste': _perfil()}, emitir)
+    assert parciais
+    for evento in parciais:
+        ids = [cid for cid, _, _ in evento['posicoes']]
+        assert len(ids) == len(set(ids)) == evento['alocados']
+
+
+def test_planejar_local_respeita_limites_do_navio():
+    random.seed(2)
+    perfil = _perfil()
+    pedido = _pedido()
+    final = sp.planejar_local(pedido, {'teste': perfil})[-1]
+    assert final['evento'] == 'final'
+
+    pesos = {cid: peso for cid, _, peso in pedido['containers']}
+    ids = [cid for cid, _, _ in final['posicoes']]
+    assert len(ids) == len(set(ids))
+
+    altura, peso_pilha = {}, {}
+    for cid, x, y in final['posicoes']:
+        assert 0 <= x < perfil.num_baias and 0 <= y < perfil.num_pilhas
+        altura[(x, y)] = altura.get((x, y), 0) + 1
+        peso_pilha[(x, y)] = peso_pilha.get((x, y), 0) + pesos[cid]
+    assert max(altura.values()) <= perfil.altura_max
+    assert max(peso_pilha.values()) <= perfil.peso_max_pilha
+    assert final['alocados'] <= final['limite']
+
+
+def test_ids_repetidos_viram_erro_claro():
+    pedido = _pedido()
+    pedido['containers'][5][0] = 3
+    eventos = sp.planejar_local(pedido, {'teste': _perfil()})
+    assert [e['evento'] for e in eventos] == ['erro']
+    assert 'repetidos' in eventos[0]['mensagem'] and '[3]' in eventos[0]['mensagem']
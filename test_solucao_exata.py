@@ -0,0 +1,41 @@
+import itertools
+import random
+
+from carregar_vessel import VesselProfile
+from heuristica_distribuicao import Container
+import solucao_exata
+
+
+def _perfil_3x3():
+    return VesselProfile(
+        num_baias=3, num_pilhas=3, altura_max=1,
+        capacidade_20ft=1, capacidade_40ft=1,
+        peso_max_pilha=999999, limite_grav_long=0.3, limite_grav_trans=0.3,
+    )
+
+
+def _containers(pesos):
+    return [Container(i, '40ft', p) for i, p in enumerate(pesos)]
+
+
+def test_branch_and_bound_e_otimo_so_na_ordem_dada():
+    perfil = _perfil_3x3()
+    cs = _containers([20, 40, 1, 1, 40])
+
+    navio, otimo_na_ordem = solucao_exata.branch_and_bound(cs, perfil)
+    assert otimo_na_ordem
+    assert len(navio.allocated) == 4
+
+    # em outra ordem de inserção os cinco cabem, e o limite superior cobre isso
+    melhor = max(len(solucao_exata.branch_and_bound(list(ordem), perfil)[0].allocated)
+                 for ordem in itertools.permutations(cs))
+    assert melhor == 5
+    assert solucao_exata.limite_superior(cs, perfil) >= 5
+
+
+def test_limite_superior_nao_fica_abaixo_da_busca():
+    rng = random.Random(5)
+    perfil = VesselProfile(3, 3, 2, 2, 2, 60, 0.15, 0.15)
+    cs = _containers([rng.randint(5, 30) for _ in range(25)])
+    navio, _ = solucao_exata.branch_and_bound(cs, perfil)
+    assert len(navio.allocated) <= solucao_exata.limite_superior(cs, perfil)